@@ -3,7 +3,7 @@ import typing as ty
 import re
 from pathlib import Path
 import inspect
-import docker.errors
+from types import MappingProxyType
 from typing import dataclass_transform
 from pydra.compose.base import (
     ensure_field_objects,
@@ -18,6 +18,15 @@ from .task import BidsAppOutputs as Outputs
 
 logger = logging.getLogger("pydra.compose.bidsapp")
 
+# Names of inputs that are set from the wrapped executable/image
+RESERVED_INPUT_NAMES = frozenset(["executable", "image_tag"])
+
+# Fields inherited from the base task/outputs classes, which only need to be looked
+# up once rather than every time a task is defined. They are shared between all
+# definitions so are exposed as read-only mappings
+BASE_INPUTS = MappingProxyType({n: getattr(Task, n) for n in Task.BASE_ATTRS})
+BASE_OUTPUTS = MappingProxyType({n: getattr(Outputs, n) for n in Outputs.BASE_ATTRS})
+
 
 @dataclass_transform(
     kw_only_default=True,
@@ -115,18 +124,14 @@ def define(
                     class_name = Path(executable).name.split(".")[0]
                     if class_name[0].isdigit():
                         class_name = DIGIT_TO_WORD[class_name[0]] + class_name[1:]
-                class_name = re.sub(r"[^a-zA-Z0-9]", "_", class_name)
+                class_name = INVALID_CLASS_NAME_CHARS_RE.sub("_", class_name)
 
-            parsed_inputs = (
-                inputs if isinstance(inputs, dict) else {i.name: i for i in inputs}
-            )
-            parsed_outputs = (
-                outputs if isinstance(outputs, dict) else {o.name: o for o in outputs}
-            )
+            parsed_inputs = _fields_to_dict(inputs)
+            parsed_outputs = _fields_to_dict(outputs)
 
             # Add in fields from base classes
-            parsed_inputs.update({n: getattr(Task, n) for n in Task.BASE_ATTRS})
-            parsed_outputs.update({n: getattr(Outputs, n) for n in Outputs.BASE_ATTRS})
+            parsed_inputs.update(BASE_INPUTS)
+            parsed_outputs.update(BASE_OUTPUTS)
 
             parsed_inputs, parsed_outputs = ensure_field_objects(
                 arg_type=arg,
@@ -136,7 +141,7 @@ def define(
                 input_helps={},
                 output_helps={},
             )
-        if clashing := set(parsed_inputs) & set(["exectuable", "image_tag"]):
+        if clashing := RESERVED_INPUT_NAMES.intersection(parsed_inputs):
             raise ValueError(f"{list(clashing)} are reserved input names")
 
         parsed_inputs["executable"] = arg(
@@ -167,25 +172,45 @@ def define(
     return make
 
 
-DIGIT_TO_WORD = {
-    "0": "zero",
-    "1": "one",
-    "2": "two",
-    "3": "three",
-    "4": "four",
-    "5": "five",
-    "6": "six",
-    "7": "seven",
-    "8": "eight",
-    "9": "nine",
-}
+def _fields_to_dict(
+    specs: ty.Sequence[arg | out] | dict[str, ty.Any] | None,
+) -> dict[str, ty.Any]:
+    """Normalise the inputs/outputs passed to `define` into a new name->field dict.
+    Field objects are passed through as is so they aren't re-converted, and a new dict
+    is always returned so the caller's mapping isn't mutated when the base-class fields
+    are added to it"""
+    if not specs:
+        return {}
+    if isinstance(specs, dict):
+        return dict(specs)
+    return {s.name: s for s in specs}
+
+
+INVALID_CLASS_NAME_CHARS_RE = re.compile(r"[^a-zA-Z0-9]")
+
+DIGIT_TO_WORD = MappingProxyType(
+    {
+        "0": "zero",
+        "1": "one",
+        "2": "two",
+        "3": "three",
+        "4": "four",
+        "5": "five",
+        "6": "six",
+        "7": "seven",
+        "8": "eight",
+        "9": "nine",
+    }
+)
 
 
-def get_docker_entrypoint(image_tag: str) -> str:
+def get_docker_entrypoint(image_tag: str) -> list[str]:
     """Pulls a given Docker image tag and inspects the image to get its
     entrypoint/cmd
 
     IMAGE_TAG is the tag of the Docker image to inspect"""
+    import docker
+
     dc = docker.from_env()
 
     dc.images.pull(image_tag)
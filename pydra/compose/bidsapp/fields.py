@@ -2,6 +2,9 @@ import attrs
 import re
 from pydra.compose import base
 
+# Matches input paths of the form 'modality/suffix'
+INPUT_PATH_RE = re.compile(r"\w+/\w+")
+
 
 @attrs.define(kw_only=True)
 class arg(base.Arg):
@@ -46,7 +49,7 @@ class arg(base.Arg):
         """Validate the path of the input field"""
         if not isinstance(value, str):
             raise TypeError(f"Path must be a string, got {type(value)}")
-        if not re.match(r"\w+/\w+", value):
+        if not INPUT_PATH_RE.match(value):
             raise ValueError(f"Path must be of the form 'modality/suffix', got {value}")
 
 
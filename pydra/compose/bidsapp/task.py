@@ -1,15 +1,11 @@
+import os
 import attrs
+import re
 import typing as ty
 from pathlib import Path
 import logging
-from frametree.core import __version__
-from frametree.core.frameset import FrameSet
-from frametree.common import Clinical
-from frametree.bids.store import Bids
-from pydra.utils import asdict, get_fields
+from pydra.utils import get_fields
 from pydra.compose import base
-from pydra.environments.docker import Docker
-from pydra.environments.native import Native
 from . import fields
 from .app import BidsApp
 
@@ -17,6 +13,35 @@ logger = logging.getLogger("pydra.compose.bidsapp")
 
 if ty.TYPE_CHECKING:
     from pydra.engine.job import Job
+    from frametree.core.frameset import FrameSet
+
+# A token is one or more adjacent single-quoted, double-quoted or bare segments
+JSON_EDIT_SEGMENT_RE = re.compile(r"""'([^']*)'|"([^"]*)"|([^\s'"]+)""")
+JSON_EDIT_TOKEN_RE = re.compile(r"""(?:'[^']*'|"[^"]*"|[^\s'"])+""")
+
+
+def json_edits_converter(
+    json_edits: str | list[tuple[str, str]],
+) -> list[tuple[str, str]]:
+    """Converts JSON edits provided as a single "PATH EDIT_STR PATH EDIT_STR ..." string
+    into a list of (path, edit) pairs. Tokens are split on whitespace and can be quoted
+    with single or double quotes, with adjacent quoted/bare segments joined into a single
+    token as in a shell (e.g. x'a'"b" -> xab). Unlike shlex, backslash escapes are not
+    interpreted"""
+    if not isinstance(json_edits, str):
+        return json_edits
+    # Anything other than whitespace left after removing the tokens is a stray quote
+    if JSON_EDIT_TOKEN_RE.sub("", json_edits).strip():
+        raise ValueError(f"Unbalanced quotes in JSON edits {json_edits!r}")
+    tokens = [
+        "".join(s[s.lastindex] for s in JSON_EDIT_SEGMENT_RE.finditer(t[0]))
+        for t in JSON_EDIT_TOKEN_RE.finditer(json_edits)
+    ]
+    if len(tokens) % 2:
+        raise ValueError(
+            f"JSON edits must be provided as pairs of paths and edits, got {json_edits!r}"
+        )
+    return list(zip(tokens[::2], tokens[1::2]))
 
 
 @attrs.define(kw_only=True, auto_attribs=False, eq=False, repr=False)
@@ -39,19 +64,17 @@ class BidsAppOutputs(base.Outputs):
         outputs : Outputs
             The outputs of the job in dataclass
         """
+        from frametree.common import Clinical
+
         outputs = super()._from_job(job)
-        frameset: FrameSet = job.return_values["frameset"]
-        output_fields: ty.List[fields.out] = get_fields(cls)
+        frameset: "FrameSet" = job.return_values["frameset"]
+        output_fields: tuple[fields.out, ...] = tuple(get_fields(cls))
         for output_field in output_fields:
-            if output_field.path:
-                path = output_field.path
-            else:
-                path = ""  # whole directory
-            path += "@" + DEFAULT_DERIVATIVES_NAME
+            # an empty path selects the whole derivatives directory
             frameset.add_sink(
                 output_field.name,
                 output_field.type,
-                path=path,
+                path=f"{output_field.path}@{DEFAULT_DERIVATIVES_NAME}",
             )
         row = frameset.row(Clinical.session, DEFAULT_BIDS_ID)
         with frameset.store.connection:
@@ -69,6 +92,8 @@ class BidsAppTask(base.Task[BidsAppOutputsType]):
     _executor_name = "executable"
 
     BASE_ATTRS = ("analysis_level", "json_edits", "flags")
+    # Names of fields that aren't stored in the BIDS dataset
+    NON_BIDS_ATTRS = frozenset(BASE_ATTRS + ("executable", "image_tag"))
 
     analysis_level: str = fields.arg(
         name="analysis_level",
@@ -81,6 +106,12 @@ class BidsAppTask(base.Task[BidsAppOutputsType]):
         name="json_edits",
         type=list[tuple[str, str]],
         default=attrs.Factory(list),
+        converter=json_edits_converter,
+        help=(
+            "Edits to apply to the JSON side-cars as they are written to the dataset, "
+            "as (path-expression, jq-filter) pairs or a single string of alternating "
+            "path expressions and filters"
+        ),
         path="not/used",
     )
     flags: str = fields.arg(
@@ -96,36 +127,41 @@ class BidsAppTask(base.Task[BidsAppOutputsType]):
     )
 
     def _run(self, job: "Job[BidsAppTask]", rerun: bool = True) -> None:
+        # All internal directories are laid out under the job's working directory
+        job_dir = Path.cwd()
+        dataset_dir = job_dir / DATASET_DIR_NAME
         # Create a BIDS dataset and save input data into it
-        job.return_values["frameset"] = frameset = self._create_dataset()
-        output_dir = (
-            Path(frameset.id)
-            / "derivatives"
-            / DEFAULT_DERIVATIVES_NAME
-            / f"sub-{DEFAULT_BIDS_ID}"
-        )
-        cache_root = Path.cwd() / "internal-cache"
-        work_dir = Path.cwd() / "work-dir"
-        work_dir.mkdir(parents=True, exist_ok=True)
+        job.return_values["frameset"] = self._create_dataset(dataset_dir)
+        output_dir = dataset_dir / APP_OUTPUT_SUBPATH
+        cache_root = job_dir / INTERNAL_CACHE_DIR_NAME
+        work_dir = job_dir / WORK_DIR_NAME
+        os.makedirs(work_dir, exist_ok=True)
         app = BidsApp(
             executable=self.executable,
-            dataset_path=frameset.id,
+            dataset_path=dataset_dir,
             output_path=output_dir,
             analysis_level=self.analysis_level,
             participant_label=DEFAULT_BIDS_ID,
             flags=self.flags,
             work_dir=work_dir,
         )
-        environment = Docker(self.image_tag) if self.image_tag else Native()
+        if self.image_tag:
+            from pydra.environments.docker import Docker
+
+            environment = Docker(self.image_tag)
+        else:
+            from pydra.environments.native import Native
+
+            environment = Native()
         app(cache_root=cache_root, environment=environment)
 
-    def _create_dataset(self) -> FrameSet:
-        # Prepare the inputs to the function
-        inputs = asdict(self)
-        for atr in self.BASE_ATTRS:
-            del inputs[atr]
+    def _create_dataset(self, dataset_dir: Path) -> "FrameSet":
+        # Imported here as the BIDS store pulls in a large number of dependencies that
+        # aren't required until the task is actually run
+        from frametree.core import __version__
+        from frametree.common import Clinical
+        from frametree.bids.store import Bids
 
-        dataset_dir = Path.cwd() / "bids-dataset"
         frameset = Bids().create_dataset(
             id=dataset_dir,
             name=DEFAULT_FRAMESET_NAME,
@@ -134,28 +170,24 @@ class BidsAppTask(base.Task[BidsAppOutputsType]):
         )
 
         # Update the Bids store with the JSON edits requested by the user
-        # je_args = shlex.split(self.json_edits) if json_edits else []
         bids_store: Bids = frameset.store
         bids_store.json_edits = self.json_edits
 
-        # JsonEdit.attr_converter(
-        #     self.json_edits + list(zip(je_args[::2], je_args[1::2]))
-        # )
-        input_fields: list[fields.arg] = [
-            f
-            for f in get_fields(self)
-            if f.name not in self.BASE_ATTRS + ("executable", "image_tag")
-        ]
+        input_fields: tuple[fields.arg, ...] = tuple(
+            f for f in get_fields(self) if f.name not in self.NON_BIDS_ATTRS
+        )
         for inpt in input_fields:
             frameset.add_sink(inpt.name, inpt.type, path=inpt.path)
+        input_names = tuple(i.name for i in input_fields)
+        to_store = {n: v for n in input_names if (v := getattr(self, n))}
+        if logger.isEnabledFor(logging.WARNING) and (
+            missing := [n for n in input_names if n not in to_store]
+        ):
+            logger.warning("No input provided for '%s' inputs", "', '".join(missing))
         row = frameset.row(Clinical.session, DEFAULT_BIDS_ID)
         with frameset.store.connection:
-            for inpt in input_fields:
-                inpt_value = inputs[inpt.name]
-                if not inpt_value:
-                    logger.warning("No input provided for '%s' input", inpt.name)
-                    continue
-                row[inpt.name] = inpt_value
+            for inpt_name, inpt_value in to_store.items():
+                row[inpt_name] = inpt_value
         return frameset
 
 
@@ -167,3 +199,10 @@ DEFAULT_BIDS_ID = "DEFAULT"
 DEFAULT_FRAMESET_NAME = "DEFAULT"
 DEFAULT_DERIVATIVES_NAME = "DEFAULT"
 OUTPUT_DIR_NAME = "output-dir"
+DATASET_DIR_NAME = "bids-dataset"
+WORK_DIR_NAME = "work-dir"
+INTERNAL_CACHE_DIR_NAME = "internal-cache"
+# Location the app writes its outputs to, relative to the root of the dataset
+APP_OUTPUT_SUBPATH = (
+    Path("derivatives") / DEFAULT_DERIVATIVES_NAME / f"sub-{DEFAULT_BIDS_ID}"
+)
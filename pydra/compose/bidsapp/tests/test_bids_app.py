@@ -5,7 +5,7 @@ import shutil
 import pytest
 from fileformats.medimage import NiftiGzX, NiftiGzXBvec
 from pydra.compose import bidsapp
-from pydra.compose.bidsapp.task import DEFAULT_BIDS_ID
+from pydra.compose.bidsapp.task import DEFAULT_BIDS_ID, json_edits_converter
 from pydra.utils import asdict
 from fileformats.text import Plain as Text
 from fileformats.generic import Directory
@@ -89,3 +89,37 @@ def test_bids_app_naked(
 
     for output in asdict(outputs).values():
         assert Path(output).exists()
+
+
+def test_json_edits_converter_quoted():
+    assert json_edits_converter(
+        """anat/T1w '.a = "b"' func/.* ".c = 1" dwi/dwi x'a'"b\""""
+    ) == [("anat/T1w", '.a = "b"'), ("func/.*", ".c = 1"), ("dwi/dwi", "xab")]
+
+
+def test_json_edits_converter_empty():
+    assert json_edits_converter("") == []
+
+
+def test_json_edits_converter_pairs_passthrough():
+    json_edits = [("anat/T1w", ".a = 1")]
+    assert json_edits_converter(json_edits) is json_edits
+
+
+def test_json_edits_converter_odd_tokens():
+    with pytest.raises(ValueError, match="pairs of paths and edits"):
+        json_edits_converter("anat/T1w '.a = 1' func/.*")
+
+
+def test_json_edits_converter_unbalanced_quotes():
+    with pytest.raises(ValueError, match="Unbalanced quotes"):
+        json_edits_converter("anat/T1w '.a = 1")
+
+
+def test_reserved_input_name():
+    with pytest.raises(ValueError, match="reserved input names"):
+        bidsapp.define(
+            "/path/to/app",
+            inputs=[bidsapp.arg(name="executable", path="anat/T1w", type=str)],
+            outputs=BIDS_OUTPUTS,
+        )